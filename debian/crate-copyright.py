@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+# Copyright: 2015-2019 The Debian Project
+# License: MIT or Apache-2.0
+#
+# Guess debian/copyright stanzas for vendored crates, like dh-cargo's
+# guess-crate-copyright does. Unlike that script, commit years are read
+# in-process with pygit2 from a persistent bare-clone cache under
+# ~/.cache/crate-copyright, instead of shelling out to a fresh
+# `git clone` + `git log | head | cut` pipeline for every crate.
+# Without pygit2 it falls back to one plain `git log` per repository.
+
+import concurrent.futures
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "crate-copyright")
+
+# Big enough to slurp any Cargo.toml with a single read syscall.
+BUFSIZE = 1 << 17
+
+def clone_path(url):
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+def pygit2_years(url):
+    path = clone_path(url)
+    if os.path.isdir(path):
+        repo = pygit2.Repository(path)
+    else:
+        repo = pygit2.clone_repository(url, path, bare=True)
+    walker = repo.walk(repo.head.target,
+        pygit2.GIT_SORT_TIME | pygit2.GIT_SORT_REVERSE)
+    first = last = next(walker).commit_time
+    for commit in walker:
+        last = commit.commit_time
+    return time.gmtime(first).tm_year, time.gmtime(last).tm_year
+
+def git_years(url):
+    # Same thing without pygit2: one `git log` per repository, streamed and
+    # parsed here rather than through a shell and head/cut helpers. The first
+    # line is the newest commit, the last line the oldest.
+    path = clone_path(url)
+    if not os.path.isdir(path):
+        # Commits and trees only — the blobs are never looked at. The
+        # commit-graph then makes the history walk cheap even for
+        # rust-lang/rust-sized repositories; best effort, old git lacks it.
+        subprocess.check_call(["git", "clone", "--quiet", "--bare",
+            "--filter=blob:none", url, path])
+        subprocess.call(["git", "-C", path, "commit-graph", "write",
+            "--reachable"], stderr=subprocess.DEVNULL)
+    proc = subprocess.Popen(["git", "-C", path, "log", "--format=%cI"],
+        stdout=subprocess.PIPE, universal_newlines=True)
+    first = last = next(proc.stdout)
+    for line in proc.stdout:
+        last = line
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    return int(last[:4]), int(first[:4])
+
+# Many crates in a workspace share one repository (all rustc_* crates point
+# at rust-lang/rust), so remember the answer per URL. The per-URL lock makes
+# racing workers wait for the first lookup instead of cloning twice.
+_years_cache = {}
+_years_locks = {}
+_cache_lock = threading.Lock()
+
+def repo_years(url):
+    key = url.rstrip("/")
+    with _cache_lock:
+        if key in _years_cache:
+            return _years_cache[key]
+        lock = _years_locks.setdefault(key, threading.Lock())
+    with lock:
+        with _cache_lock:
+            if key in _years_cache:
+                return _years_cache[key]
+        if not os.path.isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        years = pygit2_years(url) if pygit2 is not None else git_years(url)
+        with _cache_lock:
+            _years_cache[key] = years
+    return years
+
+def crate_copyright(crate):
+    with open(os.path.join(crate, "Cargo.toml"), "rb", buffering=BUFSIZE) as fp:
+        package = tomllib.load(fp)["package"]
+
+    this_year = time.gmtime().tm_year
+    first, last = this_year, this_year
+    repository = package.get("repository")
+    if repository:
+        try:
+            first, last = repo_years(repository)
+        except (subprocess.CalledProcessError,
+                pygit2.GitError if pygit2 else OSError) as e:
+            sys.stderr.write("%s: %s\n" % (repository, e))
+
+    copyright = "\n           ".join("%s-%s %s" % (first, last, author)
+        for author in package.get("authors", ["UNKNOWN AUTHORS"]))
+    stanza = ["Files: %s/*" % crate.rstrip("/"),
+              "Copyright: %s" % copyright,
+              "License: %s" % package.get("license", "UNKNOWN").replace("/", " or ")]
+    if repository:
+        stanza.append("Comment: see %s" % repository)
+    return "\n".join(stanza) + "\n"
+
+def expand_crates(args):
+    # Arguments are crate directories; a directory without a Cargo.toml
+    # (e.g. vendor/) stands for all the crates inside it. scandir hands back
+    # the d_type with each entry, so no extra stat per candidate.
+    crates = []
+    for arg in args:
+        if os.path.isfile(os.path.join(arg, "Cargo.toml")):
+            crates.append(arg)
+        else:
+            with os.scandir(arg) as it:
+                crates.extend(sorted(e.path for e in it
+                    if e.is_dir(follow_symlinks=False)))
+    return crates
+
+if __name__ == "__main__":
+    crates = expand_crates(sys.argv[1:])
+    # Crates are independent and the work is dominated by network and git
+    # waits, so overlap them; map() still yields results in input order.
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(16, len(crates) or 1)) as executor:
+        for stanza in executor.map(crate_copyright, crates):
+            print(stanza)
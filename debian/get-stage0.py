@@ -3,13 +3,16 @@
 # In that case, you probably just need to override the failing step in our
 # DownloadOnlyRustBuild class below.
 
+import os
 import sys
 
 import bootstrap
 from bootstrap import RustBuild
 
 class DownloadOnlyRustBuild(RustBuild):
-    triple = None
+    def __init__(self, triple):
+        RustBuild.__init__(self)
+        self.triple = triple
     def build_bootstrap(self):
         pass
     def run(self, *args):
@@ -22,10 +25,26 @@ class DownloadOnlyRustBuild(RustBuild):
         return "true"
 
 def main(argv):
-    triple = argv.pop(1)
-    DownloadOnlyRustBuild.triple = triple
-    bootstrap.RustBuild = DownloadOnlyRustBuild
-    bootstrap.bootstrap(False)
+    # Instantiate our subclass directly and drive only the download, instead
+    # of swapping bootstrap.RustBuild behind the module's back and letting
+    # bootstrap.bootstrap() re-parse argv and walk through all the build
+    # steps we stub out anyway.
+    build = DownloadOnlyRustBuild(argv.pop(1))
+    build.rust_root = os.path.abspath(os.path.join(__file__, '../..'))
+    try:
+        with open('config.toml') as config:
+            build.config_toml = config.read()
+    except (OSError, IOError):
+        pass
+    data = bootstrap.stage0_data(build.rust_root)
+    build.date = data['date']
+    build.rustc_channel = data['rustc']
+    build.cargo_channel = data['cargo']
+    if 'dev' in data:
+        build.set_dev_environment()
+    build.build = build.build_triple()
+    build.download_stage0()
+    sys.stdout.flush()
 
 if __name__ == '__main__':
     main(sys.argv)